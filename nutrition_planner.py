@@ -1,275 +1,641 @@
-# to pick from a array of foods randomly
-import random
-
-# pandas to store and alter food data
-import pandas as pd
-
-# activity level multiplyer per pound, based on how high or low activty is
-factors = {
-        "low": 12.0,
-        "medium": 14.0,
-        "high": 16.0,
-        }
-
-
-class Person:
-    """
-    Class storing users personal weight goals
-
-    Attributes
-    ----------
-    current_w : float
-        Current weight input by user, in pounds
-    goal_w : float
-        Goal weight input by user, in pounds
-    timeline : float
-        User input in weeks for when they want to be at goal weight 
-    activity : str ('low', 'medium', 'high')
-        User selection for how active they are each week
-    health_concern : Boolean
-        Health concerns that will create concern for saturated fat (True or False)
-    """
-
-    def __init__(self, current_w, goal_w, timeline,
-                 activity, health_concern= False,
-                 calorie_target = 2000, sat_fat = 1):
-        
-        self.current_w = current_w
-        self.goal_w = goal_w
-        self.timeline = timeline
-        self.activity = activity
-        self.health_concern = health_concern
-        self.calorie_target = calorie_target
-        self.fiber_grams = (self.calorie_target / 1000) * 14
-        self.sat_fat = ((calorie_target * 0.07) / 9)
-
-
-    def goal_type(self):
-        """
-        Determine if the users wants to gain, lose, or maintain their weight
-
-        Return : str
-            'lose', 'gain', or 'maintain' based on goal weight.
-        """
-        if self.goal_w < self.current_w:
-            return "lose"
-        elif self.goal_w > self.current_w:
-            return "gain"
-        return "maintain"
-    
-
-    def daily_calorie_target(self):
-        """
-        Calculate estimated daily calories needed to reach goal weight
-        within the user's chosen timeline, and validifies if timeline is possible.
-
-        Returns
-        -------
-        calorie_target : float
-            Estimated daily calorie intake for weight goal.
-        unhealthy : boolean
-            determines if the weight lose goal is unhealthy if its more than 1000 cals/day
-        """
-
-        maintenance = maintain_cals(self.current_w, self.activity)
-
-        # compute difference, could be negative or positive
-        pounds_change = self.goal_w - self.current_w
-
-        # 1 pound is 3500, multiple pounds needed for change by calories to convert 
-        total_calorie_shift = pounds_change * 3500
-    
-        # Spread across timeline, and convert weeks to days, use 1 if timeline is unusable
-        days = max(self.timeline * 7, 1)
-
-        daily_adjustment = total_calorie_shift / days
-
-        # if user loses or gains more than 1000 calories per day = unhealthy
-        unhealthy = abs(daily_adjustment) > 1000
-
-        calorie_target = maintenance + daily_adjustment
-
-        return calorie_target, unhealthy
-
-
-    def protein_grams(self):
-        """
-        Estimate grams of protein needed per day based on user weight
-        and goal type (lose, gain, or maintain).
-
-        Returns
-        -------
-        self.current_w * multiplier : float
-           Recommended grams of protein per day.
-        """
-        goal = self.goal_type()
-
-        # higher protein when trying to lose weight
-        if goal == "lose":
-           multiplier = 1.0
-        else:
-            multiplier = 0.8
-
-        return self.current_w * multiplier
-    
-
-
-def maintain_cals(weight_lb, activity_level):
-    """
-    Estimate daily maintenance calories based on weight and activity.
-
-    Parameters
-    ----------
-    weight_lb : float
-        Body weight in pounds.
-    activity_level : str
-        One of 'low', 'medium', or 'high'.
-
-    Returns
-    -------
-    maintain : float
-        Estimated number of calories needed per day to maintain weight.
-    """
-
-    # pulls activity level in lowercase, defaulting to 14 if input improperly
-    factor = factors.get(activity_level.lower(), 14.0)
-
-    maintain = weight_lb * factor 
-
-    return maintain
-        
-
-class FoodDatabase:
-    """
-    Store example low- and high-calorie food options and methods 
-    to view and generate meals.
-
-    Attributes
-    ----------
-    low_cal : dict
-        food categories with lists of (name, calories)
-        for lower calorie foods
-    high_cal : dict
-        food categories with lists of (name, calories)
-        for higher calorie foods
-    """
-
-    def __init__(self):
-        # low calorie foods, name with amount, calories
-        self.low_cal = {
-            "protein": [
-                ("chicken breast, 100g", 165),
-                ("tofu, 100g", 80),
-                ("egg whites, 3 large", 50),
-            ],
-            "dairy": [
-                ("nonfat Greek yogurt, 150g", 90),
-                ("skim milk, 1 cup", 80),
-            ],
-            "veggies": [
-                ("spinach, 2 cups", 20),
-                ("broccoli, 1 cup", 55),
-            ],
-            "grain": [
-                ("brown rice, 1/2 cup cooked", 110),
-                ("quinoa, 185g", 222),
-            ],
-        }
-
-        self.high_cal = {
-            "protein": [("peanut butter, 32g", 188),
-                        ("ground beef, 100g", 250)
-                        ],
-
-            "dairy": [("cheddar cheese, 1 oz", 115),
-                      ("whole milk, 1 cup", 150)
-                      ],
-
-            "veggies": [("sweet potato, 1 medium", 110),
-                        ("avocado, 1/2", 120)
-                        ],
-
-            "grain": [("white rice, 1 cup cooked", 200),
-                      ("pasta, 1 cup cooked", 220)
-                      ],
-        }
-
-    def store_food_df(self, group="low"):
-        """
-        Convert stored foods to a pandas DataFrame.
-
-        Parameters
-        ----------
-        group : str
-            low for low-calorie foods, high for high-calorie foods
-
-        Returns
-        -------
-        df.sort_values("calories") : pandas.DataFrame
-            table of foods with group, category, name, and calories
-        """
-        if group == "low":
-            source = self.low_cal
-            label = "low_cal"
-        else:
-            source = self.high_cal
-            label = "high_cal"
-
-        rows = []
-        for category, foods in source.items():
-            for name, cals in foods:
-                rows.append({
-                    "group": label,
-                    "category": category,
-                    "food": name,
-                    "calories": cals,
-                })
-
-        df = pd.DataFrame(rows)
-        return df.sort_values("calories")
-
-
-    def random_meal(self, person):
-        """
-        Generate a meal based to someone's goal (lose vs gain), give them ingredients from 
-        each catergory of meal type
-
-        Parameters
-        ----------
-        person : Person
-            The user instance to evaluate goal type.
-
-        Returns
-        -------
-        meal_items : list of str
-            foods selected from each category for the meal
-        total_cals : int
-            sum of calories from selected foods
-        group_used : str
-            food group was selected, low or high
-        """
-
-        # Decide group automatically based on goal
-        if person.goal_type() == "lose":
-            source = self.low_cal
-            group = "low"
-        elif person.goal_type() == "gain":
-            source = self.high_cal
-            group = "high"
-        else:
-            # maintain does random pick of either low/high cal foods
-            source = random.choice([self.low_cal, self.high_cal])
-            group = "balanced"
-
-        meal_items = []
-        total_cals = 0
-
-        for category, foods in source.items():
-            name, cals = random.choice(foods)
-            meal_items.append(f"{category}: {name}")
-            total_cals += cals
-
-        return meal_items, total_cals, group
-    
-
-    
\ No newline at end of file
+# to pick from a array of foods randomly
+import random
+
+# sys.intern lets maintain_cals compare activity levels by identity
+import sys
+
+# lru_cache to memoize pure helpers, partial to prebind meal generators
+from functools import lru_cache, partial
+
+# pandas to store and alter food data
+import pandas as pd
+
+# numpy for fast array based picks and sums
+import numpy as np
+
+# activity level multiplyer per pound, based on how high or low activty is
+factors = {
+        "low": 12.0,
+        "medium": 14.0,
+        "high": 16.0,
+        }
+
+# integer codes and a lookup table for the vectorized calorie functions,
+# unknown activity strings fall back to medium just like maintain_cals
+_ACTIVITY_CODES = {"low": 0, "medium": 1, "high": 2}
+_FACTOR_LUT = np.array([12.0, 14.0, 16.0])
+
+# grams of fiber and saturated fat allowed per calorie, precomputed so
+# Person.__init__ only multiplies (14g fiber per 1000 cals, 7% of cals
+# from saturated fat at 9 cals per gram)
+_FIBER_PER_CAL = 14.0 / 1000.0
+_SAT_FAT_PER_CAL = 0.07 / 9.0
+
+# interned activity strings so maintain_cals can branch on identity
+# instead of hashing into the factors dict
+_LOW = sys.intern("low")
+_MEDIUM = sys.intern("medium")
+_HIGH = sys.intern("high")
+
+
+class Person:
+    """
+    Class storing users personal weight goals
+
+    Attributes
+    ----------
+    current_w : float
+        Current weight input by user, in pounds
+    goal_w : float
+        Goal weight input by user, in pounds
+    timeline : float
+        User input in weeks for when they want to be at goal weight 
+    activity : str ('low', 'medium', 'high')
+        User selection for how active they are each week
+    health_concern : Boolean
+        Health concerns that will create concern for saturated fat (True or False)
+    """
+
+    # slots keep instances small when many candidate plans are built;
+    # _goal_type holds the cached goal since slots remove the __dict__
+    # that cached_property would need
+    __slots__ = ("current_w", "goal_w", "timeline", "activity",
+                 "health_concern", "calorie_target", "fiber_grams",
+                 "sat_fat", "_goal_type")
+
+    def __init__(self, current_w, goal_w, timeline,
+                 activity, health_concern= False,
+                 calorie_target = 2000, sat_fat = 1):
+
+        self.current_w = current_w
+        self.goal_w = goal_w
+        self.timeline = timeline
+        self.activity = activity
+        self.health_concern = health_concern
+        self.calorie_target = calorie_target
+        self.fiber_grams = calorie_target * _FIBER_PER_CAL
+        self.sat_fat = calorie_target * _SAT_FAT_PER_CAL
+        self._goal_type = None
+
+
+    @property
+    def goal_type(self):
+        """
+        Determine if the users wants to gain, lose, or maintain their weight
+
+        Cached after the first lookup since current_w and goal_w are set
+        once at construction.
+
+        Return : str
+            'lose', 'gain', or 'maintain' based on goal weight.
+        """
+        if self._goal_type is None:
+            if self.goal_w < self.current_w:
+                self._goal_type = "lose"
+            elif self.goal_w > self.current_w:
+                self._goal_type = "gain"
+            else:
+                self._goal_type = "maintain"
+        return self._goal_type
+
+    def invalidate(self):
+        """
+        Clear the cached goal type, for callers that change goal_w later.
+        """
+        self._goal_type = None
+
+
+    def daily_calorie_target(self):
+        """
+        Calculate estimated daily calories needed to reach goal weight
+        within the user's chosen timeline, and validifies if timeline is possible.
+
+        Forwards to the memoized _daily_calorie_target, so repeat calls
+        with the same inputs (users re-requesting plans) hit the cache.
+
+        Returns
+        -------
+        calorie_target : float
+            Estimated daily calorie intake for weight goal.
+        unhealthy : boolean
+            determines if the weight lose goal is unhealthy if its more than 1000 cals/day
+        """
+        return _daily_calorie_target(self.current_w, self.goal_w,
+                                     self.timeline, self.activity.lower())
+
+
+    def protein_grams(self):
+        """
+        Estimate grams of protein needed per day based on user weight
+        and goal type (lose, gain, or maintain).
+
+        Returns
+        -------
+        self.current_w * multiplier : float
+           Recommended grams of protein per day.
+        """
+        goal = self.goal_type
+
+        # higher protein when trying to lose weight
+        if goal == "lose":
+           multiplier = 1.0
+        else:
+            multiplier = 0.8
+
+        return self.current_w * multiplier
+    
+
+
+def maintain_cals(weight_lb, activity_level):
+    """
+    Estimate daily maintenance calories based on weight and activity.
+
+    Parameters
+    ----------
+    weight_lb : float
+        Body weight in pounds.
+    activity_level : str
+        One of 'low', 'medium', or 'high'.
+
+    Returns
+    -------
+    maintain : float
+        Estimated number of calories needed per day to maintain weight.
+    """
+
+    # lowercase literals are interned by Python, so the usual inputs hit
+    # the identity checks without lowercasing or hashing; other casings
+    # get interned once, and anything unknown defaults to 14
+    level = activity_level
+    if level is not _LOW and level is not _MEDIUM and level is not _HIGH:
+        level = sys.intern(level.lower())
+
+    maintain = weight_lb * (12.0 if level is _LOW
+                            else 16.0 if level is _HIGH
+                            else 14.0)
+
+    return maintain
+
+
+@lru_cache(maxsize=1024)
+def _daily_calorie_target(current_w, goal_w, timeline, activity):
+    """
+    Memoized calorie target math shared by Person.daily_calorie_target.
+
+    A pure function of its inputs, so the lru_cache lets repeated
+    requests with the same weights, timeline, and activity skip the
+    arithmetic. Pass activity already lowercased so equivalent casings
+    share a cache entry.
+
+    Parameters
+    ----------
+    current_w : float
+        Current weight in pounds.
+    goal_w : float
+        Goal weight in pounds.
+    timeline : float
+        Timeline in weeks.
+    activity : str
+        Lowercased activity level, 'low', 'medium', or 'high'.
+
+    Returns
+    -------
+    calorie_target : float
+        Estimated daily calorie intake for weight goal.
+    unhealthy : boolean
+        True if the daily change is more than 1000 calories.
+    """
+
+    maintenance = maintain_cals(current_w, activity)
+
+    # compute difference, could be negative or positive
+    pounds_change = goal_w - current_w
+
+    # 1 pound is 3500, multiple pounds needed for change by calories to convert
+    total_calorie_shift = pounds_change * 3500
+
+    # Spread across timeline, and convert weeks to days, use 1 if timeline is unusable
+    days = max(timeline * 7, 1)
+
+    daily_adjustment = total_calorie_shift / days
+
+    # if user loses or gains more than 1000 calories per day = unhealthy
+    unhealthy = abs(daily_adjustment) > 1000
+
+    calorie_target = maintenance + daily_adjustment
+
+    return calorie_target, unhealthy
+
+
+def maintain_cals_vec(weight_lb_arr, activity_arr):
+    """
+    Vectorized version of maintain_cals for whole arrays of people.
+
+    Parameters
+    ----------
+    weight_lb_arr : array_like of float
+        Body weights in pounds.
+    activity_arr : sequence of str
+        Activity level per person, 'low', 'medium', or 'high'.
+
+    Returns
+    -------
+    maintain_arr : numpy.ndarray
+        Estimated maintenance calories per person.
+    """
+
+    # turn the activity strings into codes once, then one multiply
+    codes = np.fromiter((_ACTIVITY_CODES.get(a.lower(), 1) for a in activity_arr),
+                        dtype=np.int8, count=len(activity_arr))
+
+    return np.asarray(weight_lb_arr, dtype=float) * _FACTOR_LUT[codes]
+
+
+def daily_calorie_target_vec(current_w_arr, goal_w_arr, timeline_arr, activity_arr):
+    """
+    Vectorized version of Person.daily_calorie_target for batch planning.
+
+    Parameters
+    ----------
+    current_w_arr : array_like of float
+        Current weights in pounds.
+    goal_w_arr : array_like of float
+        Goal weights in pounds.
+    timeline_arr : array_like of float
+        Timelines in weeks.
+    activity_arr : sequence of str
+        Activity level per person, 'low', 'medium', or 'high'.
+
+    Returns
+    -------
+    calorie_target_arr : numpy.ndarray
+        Estimated daily calorie intake per person.
+    unhealthy_arr : numpy.ndarray of bool
+        True where the daily change is more than 1000 calories.
+    """
+
+    current_w_arr = np.asarray(current_w_arr, dtype=float)
+    goal_w_arr = np.asarray(goal_w_arr, dtype=float)
+    timeline_arr = np.asarray(timeline_arr, dtype=float)
+
+    maintenance = maintain_cals_vec(current_w_arr, activity_arr)
+
+    # same math as the scalar method, applied to every row at once
+    total_calorie_shift = (goal_w_arr - current_w_arr) * 3500
+    days = np.maximum(timeline_arr * 7, 1)
+    daily_adjustment = total_calorie_shift / days
+
+    # compare squared values instead of running an abs pass over the
+    # array; same result since 1000^2 = 1_000_000
+    unhealthy = daily_adjustment * daily_adjustment > 1_000_000.0
+
+    return maintenance + daily_adjustment, unhealthy
+
+
+def sample_meals(cals_flat, offsets, n_samples, max_cal):
+    """
+    Sample many random meals at once and keep those under a calorie cap.
+
+    Treats meal building as a small knapsack problem: draw one food per
+    category for every sample in a single vectorized pass, then filter
+    the batch by total calories.
+
+    Parameters
+    ----------
+    cals_flat : numpy.ndarray
+        calories for every food, categories laid out back to back
+    offsets : numpy.ndarray
+        start index of each category in cals_flat, with a final end index
+    n_samples : int
+        number of random meals to draw
+    max_cal : float
+        keep meals with total calories at or below this cap
+
+    Returns
+    -------
+    flat_idx : numpy.ndarray
+        food indices into cals_flat, one row of picks per kept meal
+    totals : numpy.ndarray
+        total calories of each kept meal
+    """
+
+    lens = np.diff(offsets)
+
+    # one (n_samples, n_cats) draw replaces a Python loop over samples
+    idx = np.random.randint(0, lens, size=(n_samples, lens.size))
+    flat_idx = idx + offsets[:-1]
+
+    # sum in int32 so big catalogs cannot overflow the int16 entries
+    totals = cals_flat[flat_idx].sum(axis=1, dtype=np.int32)
+    keep = totals <= max_cal
+
+    return flat_idx[keep], totals[keep]
+
+
+class FoodDatabase:
+    """
+    Store example low- and high-calorie food options and methods 
+    to view and generate meals.
+
+    Attributes
+    ----------
+    low_cal : dict
+        food categories with tuples of (name, calories)
+        for lower calorie foods
+    high_cal : dict
+        food categories with tuples of (name, calories)
+        for higher calorie foods
+    """
+
+    def __init__(self):
+        # low calorie foods, name with amount, calories
+        self.low_cal = {
+            "protein": (
+                ("chicken breast, 100g", 165),
+                ("tofu, 100g", 80),
+                ("egg whites, 3 large", 50),
+            ),
+            "dairy": (
+                ("nonfat Greek yogurt, 150g", 90),
+                ("skim milk, 1 cup", 80),
+            ),
+            "veggies": (
+                ("spinach, 2 cups", 20),
+                ("broccoli, 1 cup", 55),
+            ),
+            "grain": (
+                ("brown rice, 1/2 cup cooked", 110),
+                ("quinoa, 185g", 222),
+            ),
+        }
+
+        self.high_cal = {
+            "protein": (("peanut butter, 32g", 188),
+                        ("ground beef, 100g", 250)
+                        ),
+
+            "dairy": (("cheddar cheese, 1 oz", 115),
+                      ("whole milk, 1 cup", 150)
+                      ),
+
+            "veggies": (("sweet potato, 1 medium", 110),
+                        ("avocado, 1/2", 120)
+                        ),
+
+            "grain": (("white rice, 1 cup cooked", 200),
+                      ("pasta, 1 cup cooked", 220)
+                      ),
+        }
+
+        # the tuple catalogs hash directly into the memoized builder
+        # below; every FoodDatabase holds the same catalogs,
+        # so all instances share one cached table per group
+        low_key = tuple(self.low_cal.items())
+        high_key = tuple(self.high_cal.items())
+        self._low_table = self._build_table(low_key, "low_cal")
+        self._high_table = self._build_table(high_key, "high_cal")
+
+        # flat arrays per category (names and calories side by side) so
+        # random_meal can pick from arrays instead of looping the dicts
+        self._cats = ("protein", "dairy", "veggies", "grain")
+        self._names_low = [np.array([name for name, _ in self.low_cal[cat]],
+                                    dtype=object) for cat in self._cats]
+        self._cals_low = [np.array([cals for _, cals in self.low_cal[cat]],
+                                   dtype=np.int16) for cat in self._cats]
+        self._names_high = [np.array([name for name, _ in self.high_cal[cat]],
+                                     dtype=object) for cat in self._cats]
+        self._cals_high = [np.array([cals for _, cals in self.high_cal[cat]],
+                                    dtype=np.int16) for cat in self._cats]
+
+        # how many foods sit in each category, for the random draws
+        self._lens_low = tuple(arr.size for arr in self._names_low)
+        self._lens_high = tuple(arr.size for arr in self._names_high)
+
+        # flattened calorie/name arrays with category offsets, so the
+        # batched sampler can work on one contiguous array per group
+        self._cals_flat_low = np.concatenate(self._cals_low)
+        self._cals_flat_high = np.concatenate(self._cals_high)
+        self._names_flat_low = np.concatenate(self._names_low)
+        self._names_flat_high = np.concatenate(self._names_high)
+        self._offsets_low = np.concatenate(([0], np.cumsum(self._lens_low)))
+        self._offsets_high = np.concatenate(([0], np.cumsum(self._lens_high)))
+
+        # prebound meal generator per goal type, so random_meal only pays
+        # one dict lookup instead of re-running the if/elif chain
+        self._dispatch = {
+            "lose": partial(self._meal_from, self._names_low,
+                            self._cals_low, self._lens_low, "low"),
+            "gain": partial(self._meal_from, self._names_high,
+                            self._cals_high, self._lens_high, "high"),
+            "maintain": self._meal_balanced,
+        }
+
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def _build_table(source, label):
+        """
+        Build a sorted NumPy structured array from one of the food catalogs.
+
+        A structured array holds the same columns as the old DataFrame in
+        one compact block of memory, with no pandas per-cell objects.
+        Memoized on the frozen catalog so repeat FoodDatabase instances
+        reuse the same table instead of rebuilding it.
+
+        Parameters
+        ----------
+        source : tuple
+            frozen (category, ((name, calories), ...)) pairs
+        label : str
+            group label to store, low_cal or high_cal
+
+        Returns
+        -------
+        table : numpy.ndarray
+            structured array of foods sorted by calories
+        """
+        dtype = [("group", "U8"), ("category", "U16"),
+                 ("food", "U64"), ("calories", "i2")]
+
+        rows = [(label, category, name, cals)
+                for category, foods in source
+                for name, cals in foods]
+
+        table = np.array(rows, dtype=dtype)
+        return np.sort(table, order="calories")
+
+    def store_food_df(self, group="low"):
+        """
+        Return the stored foods as a NumPy structured array.
+
+        Parameters
+        ----------
+        group : str
+            low for low-calorie foods, high for high-calorie foods
+
+        Returns
+        -------
+        table : numpy.ndarray
+            structured array of foods with group, category, food, and
+            calories fields, sorted by calories and built once
+
+        See Also
+        --------
+        to_pandas : same table as a pandas DataFrame
+        """
+        return self._low_table if group == "low" else self._high_table
+
+    def to_pandas(self, group="low"):
+        """
+        Return the stored foods as a pandas DataFrame, for callers that
+        want pandas display or filtering.
+
+        Parameters
+        ----------
+        group : str
+            low for low-calorie foods, high for high-calorie foods
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            table of foods with group, category, food, and calories
+        """
+        return pd.DataFrame(self.store_food_df(group))
+
+
+    def random_meal(self, person):
+        """
+        Generate a meal based to someone's goal (lose vs gain), give them ingredients from 
+        each catergory of meal type
+
+        Parameters
+        ----------
+        person : Person
+            The user instance to evaluate goal type.
+
+        Returns
+        -------
+        meal_items : list of str
+            foods selected from each category for the meal
+        total_cals : int
+            sum of calories from selected foods
+        group_used : str
+            food group was selected, low or high
+        """
+
+        # each goal type has a prebound generator, so picking the group
+        # is one dict lookup instead of an if/elif chain
+        return self._dispatch[person.goal_type]()
+
+    def _meal_from(self, names, cals, lens, group):
+        """
+        Pick one food per category from the given group arrays.
+
+        Parameters
+        ----------
+        names, cals : list of numpy.ndarray
+            per-category name and calorie arrays for the group
+        lens : tuple of int
+            number of foods in each category
+        group : str
+            label to report, low, high, or balanced
+
+        Returns
+        -------
+        same (meal_items, total_cals, group_used) as random_meal
+        """
+
+        # one 32 bit draw gives a byte per category, reduced to valid
+        # indices, so the PRNG is only touched once per meal
+        bits = random.getrandbits(32)
+        idx = [((bits >> (8 * i)) & 0xFF) % lens[i]
+               for i in range(len(self._cats))]
+
+        meal_items = [f"{cat}: {names[i][idx[i]]}"
+                      for i, cat in enumerate(self._cats)]
+        total_cals = int(sum(cals[i][idx[i]] for i in range(len(self._cats))))
+
+        return meal_items, total_cals, group
+
+    def _meal_balanced(self):
+        """
+        Meal generator for the maintain goal, flipping one random bit to
+        pick low or high cal foods for the meal.
+        """
+        if random.getrandbits(1):
+            return self._meal_from(self._names_low, self._cals_low,
+                                   self._lens_low, "balanced")
+        return self._meal_from(self._names_high, self._cals_high,
+                               self._lens_high, "balanced")
+
+
+    def random_constrained_meal(self, person, max_cal, n_samples=256):
+        """
+        Generate a random meal that stays under a calorie cap, using the
+        batched sampler over the flattened food arrays.
+
+        If no sampled meal fits the cap (it may simply be unreachable,
+        since every category contributes one food), the cheapest possible
+        meal is returned instead, which can exceed max_cal. Compare
+        total_cals against max_cal to tell the two cases apart.
+
+        Parameters
+        ----------
+        person : Person
+            The user instance to evaluate goal type.
+        max_cal : float
+            Maximum total calories allowed for the meal.
+        n_samples : int
+            How many candidate meals to draw before filtering.
+
+        Returns
+        -------
+        meal_items : list of str
+            foods selected from each category for the meal
+        total_cals : int
+            sum of calories from selected foods; above max_cal only when
+            the cap was unreachable and the cheapest meal was returned
+        group_used : str
+            food group was selected, low or high or balanced
+        """
+
+        # same group selection as random_meal
+        goal = person.goal_type
+        if goal == "lose":
+            cals_flat, names_flat, offsets = (self._cals_flat_low,
+                                              self._names_flat_low,
+                                              self._offsets_low)
+            group = "low"
+        elif goal == "gain":
+            cals_flat, names_flat, offsets = (self._cals_flat_high,
+                                              self._names_flat_high,
+                                              self._offsets_high)
+            group = "high"
+        else:
+            # maintain flips one random bit to pick low or high cal foods
+            if random.getrandbits(1):
+                cals_flat, names_flat, offsets = (self._cals_flat_low,
+                                                  self._names_flat_low,
+                                                  self._offsets_low)
+            else:
+                cals_flat, names_flat, offsets = (self._cals_flat_high,
+                                                  self._names_flat_high,
+                                                  self._offsets_high)
+            group = "balanced"
+
+        flat_idx, totals = sample_meals(cals_flat, offsets, n_samples, max_cal)
+
+        if totals.size == 0:
+            # nothing fit the cap, fall back to the cheapest possible meal
+            picks = [int(cals_flat[offsets[i]:offsets[i + 1]].argmin()) + int(offsets[i])
+                     for i in range(len(self._cats))]
+            total_cals = int(cals_flat[picks].sum())
+        else:
+            # pick one of the surviving meals at random
+            winner = random.randrange(totals.size)
+            picks = flat_idx[winner]
+            total_cals = int(totals[winner])
+
+        meal_items = [f"{cat}: {names_flat[picks[i]]}"
+                      for i, cat in enumerate(self._cats)]
+
+        return meal_items, total_cals, group
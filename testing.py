@@ -1,100 +1,155 @@
-from nutrition_planner import Person, maintain_cals, FoodDatabase
-
-
-def test_goal_type():
-    # example people for each weight goal scenario, tests if weight goals align with output
-    p_lose = Person(160, 140, 12, "medium")
-    p_gain = Person(120, 150, 12, "medium")
-    p_same = Person(150, 150, 12, "medium")
-
-    # assert if lose, gain, and maintain are accurate to weight goals
-    assert p_lose.goal_type() == "lose"
-    assert p_gain.goal_type() == "gain"
-    assert p_same.goal_type() == "maintain"
-
-
-def test_maintain_cals():
-    """
-    Test that maintenance calories increase with higher activity levels 
-    for the same body weight. The calculated calories match the chosen 
-    multipliers. Activity level input is case-insensitive
-
-    """
-    # default example weight
-    weight = 150
-
-    low_cals = maintain_cals(weight, "low")
-    med_cals = maintain_cals(weight, "medium")
-    high_cals = maintain_cals(weight, "high")
-
-    # Higher activity should have higher maintenance calories
-    assert med_cals > low_cals
-    assert high_cals > med_cals
-
-    # Checks calculations, # 150 * 12 = 1800, 150 * 14 = 2100, 150 * 16 = 2400
-    assert low_cals == 1800
-    assert med_cals == 2100
-    assert high_cals == 2400
-
-    # Check case sensitivity of  input
-    med_caps = maintain_cals(weight, "MEDIUM")
-    med_rand = maintain_cals(weight, "MeDiUM")
-    assert med_caps == med_cals
-    assert med_rand == med_cals
-
-
-def test_daily_calorie_target():
-    """
-    Test that daily_calorie_target increases calories for weight gain
-    and decreases calories for weight loss, relative to maintenance.
-    """
-    # Same starting weight and activity
-    p_gain = Person(150, 170, 10, "medium")
-    p_lose = Person(150, 130, 10, "medium")
-
-    maintenance = maintain_cals(150, "medium")
-
-    gain_target, gain_unhealthy = p_gain.daily_calorie_target()
-    lose_target, lose_unhealthy = p_lose.daily_calorie_target()
-
-    assert gain_target > maintenance
-    assert lose_target < maintenance
-    assert gain_unhealthy is False
-    assert lose_unhealthy is False
-
-def test_protein_grams():
-    """
-    Test that protein_grams recommends more protein when goal is 
-    weight lose
-    """
-
-    p_lose = Person(150, 130, 12, "medium")
-    p_gain = Person(150, 170, 12, "medium")
-
-    protein_lose = p_lose.protein_grams()
-    protein_gain = p_gain.protein_grams()
-
-    assert protein_lose > protein_gain
-
-
-def test_random_meal():
-    """
-    test FoodDatabase.random_meal returns a meal_items is a non-empty list,
-    entries are strings, total calories is numeric + positive, 
-    group is one of expected labels
-
-    """
-    db = FoodDatabase()
-    p = Person(150, 140, 8, "medium")
-
-    meal_items, total_cals, group = db.random_meal(p)
-
-    assert isinstance(meal_items, list)
-    assert len(meal_items) > 0
-    assert isinstance(total_cals, (int, float))
-    assert total_cals > 0
-
-    assert group in ("low", "high", "balanced")
-
-
-    
+import pytest
+
+from nutrition_planner import (Person, maintain_cals, maintain_cals_vec,
+                               daily_calorie_target_vec, FoodDatabase)
+
+
+# shared example people, built once per module so every test reuses the
+# same instances instead of reconstructing them
+@pytest.fixture(scope="module")
+def p_lose():
+    return Person(150, 130, 12, "medium")
+
+
+@pytest.fixture(scope="module")
+def p_gain():
+    return Person(150, 170, 12, "medium")
+
+
+@pytest.fixture(scope="module")
+def p_same():
+    return Person(150, 150, 12, "medium")
+
+
+@pytest.fixture(scope="module")
+def db():
+    return FoodDatabase()
+
+
+def test_goal_type(p_lose, p_gain, p_same):
+    # assert if lose, gain, and maintain are accurate to weight goals
+    assert p_lose.goal_type == "lose"
+    assert p_gain.goal_type == "gain"
+    assert p_same.goal_type == "maintain"
+
+
+# Checks calculations, # 150 * 12 = 1800, 150 * 14 = 2100, 150 * 16 = 2400
+@pytest.mark.parametrize("activity, expected", [
+    ("low", 1800),
+    ("medium", 2100),
+    ("high", 2400),
+])
+def test_maintain_cals(activity, expected):
+    """
+    Test that the calculated calories match the chosen multipliers
+    for each activity level at the same body weight.
+    """
+    assert maintain_cals(150, activity) == expected
+
+
+def test_maintain_cals_case_insensitive():
+    """
+    Test that activity level input is case-insensitive.
+    """
+    med_cals = maintain_cals(150, "medium")
+
+    assert maintain_cals(150, "MEDIUM") == med_cals
+    assert maintain_cals(150, "MeDiUM") == med_cals
+
+
+def test_maintain_cals_vec():
+    """
+    Test that maintain_cals_vec matches the scalar maintain_cals for a
+    small batch, and that unknown activity levels fall back to medium.
+    """
+    weights = [150, 150, 150, 200]
+    activities = ["low", "MEDIUM", "high", "banana"]
+
+    batch = maintain_cals_vec(weights, activities)
+
+    for got, weight, activity in zip(batch, weights, activities):
+        assert got == maintain_cals(weight, activity)
+
+
+def test_daily_calorie_target_vec(p_lose, p_gain, p_same):
+    """
+    Test that daily_calorie_target_vec matches the scalar method per
+    person, including the unhealthy mask for too-aggressive timelines.
+    """
+    people = [p_lose, p_gain, p_same,
+              Person(200, 150, 1, "medium")]  # 50 lb in a week, unhealthy
+
+    targets, unhealthy = daily_calorie_target_vec(
+        [p.current_w for p in people],
+        [p.goal_w for p in people],
+        [p.timeline for p in people],
+        [p.activity for p in people],
+    )
+
+    for got_target, got_unhealthy, p in zip(targets, unhealthy, people):
+        target, flag = p.daily_calorie_target()
+        assert got_target == target
+        assert bool(got_unhealthy) == flag
+
+    assert list(unhealthy) == [False, False, False, True]
+
+
+def test_daily_calorie_target(p_lose, p_gain):
+    """
+    Test that daily_calorie_target increases calories for weight gain
+    and decreases calories for weight loss, relative to maintenance.
+    """
+    maintenance = maintain_cals(150, "medium")
+
+    gain_target, gain_unhealthy = p_gain.daily_calorie_target()
+    lose_target, lose_unhealthy = p_lose.daily_calorie_target()
+
+    assert gain_target > maintenance
+    assert lose_target < maintenance
+    assert gain_unhealthy is False
+    assert lose_unhealthy is False
+
+
+def test_protein_grams(p_lose, p_gain):
+    """
+    Test that protein_grams recommends more protein when goal is
+    weight lose
+    """
+
+    protein_lose = p_lose.protein_grams()
+    protein_gain = p_gain.protein_grams()
+
+    assert protein_lose > protein_gain
+
+
+def test_random_meal(db, p_lose):
+    """
+    test FoodDatabase.random_meal returns a meal_items is a non-empty list,
+    entries are strings, total calories is numeric + positive,
+    group is one of expected labels
+
+    """
+    meal_items, total_cals, group = db.random_meal(p_lose)
+
+    assert isinstance(meal_items, list)
+    assert len(meal_items) > 0
+    assert isinstance(total_cals, (int, float))
+    assert total_cals > 0
+
+    assert group in ("low", "high", "balanced")
+
+
+def test_random_constrained_meal(db, p_lose):
+    """
+    test FoodDatabase.random_constrained_meal stays at or under the
+    calorie cap when the cap is reachable, and still returns one food
+    per category
+
+    """
+    meal_items, total_cals, group = db.random_constrained_meal(p_lose, 600)
+
+    assert isinstance(meal_items, list)
+    assert len(meal_items) == 4
+    assert total_cals <= 600
+
+    assert group in ("low", "high", "balanced")